@@ -2,12 +2,8 @@
 Example of using WebAgent for news gathering
 """
 import os
-from dotenv import load_dotenv
 from src.agent import WebAgent
 
-# Load environment variables
-load_dotenv()
-
 def main():
     # Get the keys from the environment variables
     grok_api_key = os.getenv("GROK_API_KEY")
@@ -19,12 +15,10 @@ def main():
         headless=True  # True for hidden mode, False for browser display
     )
     
-    # Requesting the latest technology news
-    result = agent.run("latest technology news")
-    
     print("\n=== AGENT RESULT ===\n")
-    print(result)
-    print("\n=======================\n")
+    # Requesting the latest technology news, printing the answer as it streams
+    agent.run("latest technology news", on_token=lambda chunk: print(chunk, end="", flush=True))
+    print("\n\n=======================\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,12 +2,8 @@
 Example of using WebAgent for research
 """
 import os
-from dotenv import load_dotenv
 from src.agent import WebAgent
 
-# Load environment variables
-load_dotenv()
-
 def main():
     # Get API keys from environment variables
     grok_api_key = os.getenv("GROK_API_KEY")
@@ -34,15 +30,14 @@ def main():
     try:
         # Conduct research
         print("Starting research process...")
-        result = agent.research(
+        print("\n=== RESEARCH RESULTS ===\n")
+        agent.research(
             topic=research_topic,
             depth=3,  # Check 3 sources
-            max_time=180  # Maximum 3 minutes
+            max_time=180,  # Maximum 3 minutes
+            on_token=lambda chunk: print(chunk, end="", flush=True)  # Print report as it streams
         )
-        
-        print("\n=== RESEARCH RESULTS ===\n")
-        print(result)
-        print("\n=====================\n")
+        print("\n\n=====================\n")
     except Exception as e:
         print(f"Error during research: {str(e)}")
 
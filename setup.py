@@ -10,6 +10,9 @@ setup(
     install_requires=[
         "playwright>=1.30.0",
         "requests>=2.28.1",
+        "orjson>=3.8.0",
+        "httpx[http2]>=0.24.0",
+        "selectolax>=0.3.17",
         "python-dotenv>=0.21.0",
     ],
     classifiers=[
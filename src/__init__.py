@@ -1,4 +1,9 @@
 # WebIntelAgent - Python package for web agents
+from src.config import load_env
+
+# Load environment variables before modules read their defaults
+load_env()
+
 from src.agent import WebAgent
 
 __version__ = "0.1.0"
\ No newline at end of file
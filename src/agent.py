@@ -2,28 +2,24 @@
 Web Agent Main Class
 """
 import os
-import time
-from typing import Dict, List, Any, Optional, Union
-from dotenv import load_dotenv
+import asyncio
+import inspect
+from typing import Dict, List, Any, Optional, Union, Callable, Awaitable, Tuple
 
+from src.async_utils import run_sync
 from src.llm_providers import get_provider, LLMProvider
-from src.web_tools import WebBrowser
-
-# Load environment variables
-load_dotenv()
+from src.web_tools import WebBrowser, AsyncWebBrowser
+from src.prompt_utils import PROMPT_TOKEN_BUDGET, count_tokens, pack
+from src.strategies import SOURCE_STRATEGIES
 
 # Default values
 DEFAULT_PROVIDER = os.getenv("DEFAULT_PROVIDER", "grok")
 DEFAULT_NEWS_SITE = os.getenv("DEFAULT_NEWS_SITE", "https://www.reuters.com/technology")
+DEFAULT_MAX_CONCURRENCY = 5
+DEFAULT_SOURCE_STRATEGY = os.getenv("DEFAULT_SOURCE_STRATEGY", "trusted")
 
-# Reliable sources for AI and technology research
-RESEARCH_SOURCES = [
-    "https://www.wired.com/tag/artificial-intelligence",
-    "https://www.technologyreview.com/topic/artificial-intelligence",
-    "https://venturebeat.com/category/ai",
-    "https://www.reuters.com/technology",
-    "https://techcrunch.com/category/artificial-intelligence"
-]
+# Returns source URLs for (topic, depth, browser), either directly or as an awaitable
+SourceStrategy = Callable[[str, int, AsyncWebBrowser], Union[List[str], Awaitable[List[str]]]]
 
 class WebAgent:
     """A core class of agent for collecting and analyzing web information"""
@@ -47,12 +43,27 @@ class WebAgent:
         # Initialize LLM provider
         self.llm_provider = get_provider(provider, api_key)
     
-    def run(self, task: str) -> str:
+    def _generate(self, system_prompt: str, user_prompt: str,
+                  on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Generates an LLM response, streaming chunks to on_token if given"""
+        if on_token is None:
+            return self.llm_provider.generate_response(system_prompt, user_prompt)
+        
+        chunks = []
+        for chunk in self.llm_provider.generate_response_stream(system_prompt, user_prompt):
+            on_token(chunk)
+            chunks.append(chunk)
+        return "".join(chunks)
+    
+    def run(self, task: str, on_token: Optional[Callable[[str], None]] = None,
+            news_site: str = DEFAULT_NEWS_SITE) -> str:
         """
         Performs a task by gathering information from the internet
         
         Args:
             task: Text description of the task
+            on_token: Callback receiving response chunks as they are generated
+            news_site: Site visited for news-related tasks
             
         Returns:
             str: The result of the task execution
@@ -61,46 +72,84 @@ class WebAgent:
         with WebBrowser(headless=self.headless, user_agent=self.user_agent) as browser:
             # Visit news site or determine strategy based on task
             if "news" in task.lower():
-                content = browser.visit_news_site(DEFAULT_NEWS_SITE)
+                content = browser.visit_news_site(news_site)
             else:
                 # Search for information on Google
                 results = browser.google_search(task)
                 if results:
-                    browser.navigate(results[0])
-                    content = browser.extract_content()
+                    content = browser.fetch(results[0]) or {"error": "Failed to load page"}
                 else:
                     content = {"error": "No relevant results found"}
             
-            # Form system prompt
-            system_prompt = f"""
-            You're an expert at analyzing web content. Analyze the information provided and give a concise, 
-            informative answer to the problem: "{task}".
-            """
-            
-            # Form user prompt with content
-            user_prompt = f"Task: {task}\n\nData from page {content.get('url', 'unknown URL')}:\n"
+            # Generate response through LLM
+            system_prompt, user_prompt = self._task_prompts(task, content)
+            response = self._generate(system_prompt, user_prompt, on_token)
+            return response
+    
+    async def run_async(self, task: str, on_token: Optional[Callable[[str], None]] = None,
+                        news_site: str = DEFAULT_NEWS_SITE) -> str:
+        """
+        Asynchronous version of run() for use inside an event loop
+        
+        Args:
+            task: Text description of the task
+            on_token: Callback receiving response chunks as they are generated
+            news_site: Site visited for news-related tasks
             
-            if 'error' in content:
-                user_prompt += f"Error collecting data: {content['error']}"
+        Returns:
+            str: The result of the task execution
+        """
+        async with AsyncWebBrowser(headless=self.headless, user_agent=self.user_agent) as browser:
+            # Visit news site or determine strategy based on task
+            if "news" in task.lower():
+                content = await browser.visit_news_site(news_site)
             else:
-                # Add headers
-                if 'content' in content and 'headers' in content['content']:
-                    user_prompt += "Headers:\n"
-                    headers = content['content']['headers'][:10]  # Limit quantity
-                    user_prompt += "\n".join([f"- {header}" for header in headers])
-                    user_prompt += "\n\n"
-                
-                # Add paragraphs
-                if 'content' in content and 'paragraphs' in content['content']:
-                    user_prompt += "Content:\n"
-                    paragraphs = content['content']['paragraphs'][:15]  # Limit quantity
-                    user_prompt += "\n\n".join(paragraphs)
+                results = await browser.google_search(task)
+                if results:
+                    content = await browser.fetch(results[0]) or {"error": "Failed to load page"}
+                else:
+                    content = {"error": "No relevant results found"}
+        
+        # The blocking LLM call runs in a worker thread to keep the loop free
+        system_prompt, user_prompt = self._task_prompts(task, content)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._generate, system_prompt, user_prompt, on_token)
+    
+    @staticmethod
+    def _task_prompts(task: str, content: Dict[str, Any]) -> Tuple[str, str]:
+        """Forms system and user prompts for a task from collected page content"""
+        # Form system prompt
+        system_prompt = f"""
+        You're an expert at analyzing web content. Analyze the information provided and give a concise, 
+        informative answer to the problem: "{task}".
+        """
+        
+        # Form user prompt with content
+        parts = [f"Task: {task}\n\nData from page {content.get('url', 'unknown URL')}:\n"]
+        
+        if 'error' in content:
+            parts.append(f"Error collecting data: {content['error']}")
+        else:
+            # Add headers
+            if 'content' in content and 'headers' in content['content']:
+                parts.append("Headers:\n")
+                headers = content['content']['headers'][:10]  # Limit quantity
+                parts.append("\n".join([f"- {header}" for header in headers]))
+                parts.append("\n\n")
             
-            # Generate response through LLM
-            response = self.llm_provider.generate_response(system_prompt, user_prompt)
-            return response
+            # Add paragraphs within the remaining token budget
+            if 'content' in content and 'paragraphs' in content['content']:
+                parts.append("Content:\n")
+                budget = PROMPT_TOKEN_BUDGET - count_tokens("".join(parts))
+                paragraphs = pack(content['content']['paragraphs'], budget)
+                parts.append("\n\n".join(paragraphs))
+        
+        return system_prompt, "".join(parts)
     
-    def research(self, topic: str, depth: int = 3, max_time: int = 300) -> str:
+    def research(self, topic: str, depth: int = 3, max_time: int = 300,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 source_strategy: Union[str, SourceStrategy] = DEFAULT_SOURCE_STRATEGY) -> str:
         """
         Conducts research on a given topic by visiting multiple sources
         
@@ -108,82 +157,179 @@ class WebAgent:
             topic: Research topic
             depth: Number of sources to check
             max_time: Maximum execution time in seconds
+            max_concurrency: Maximum number of sources fetched at once
+            on_token: Callback receiving report chunks as they are generated
+            source_strategy: 'trusted', 'search' or a callable(topic, depth, browser) returning URLs
             
         Returns:
             str: Research results
         """
-        start_time = time.time()
-        all_content = []
+        return run_sync(self.research_async(
+            topic, depth, max_time, max_concurrency, on_token, source_strategy
+        ))
+    
+    async def research_async(self, topic: str, depth: int = 3, max_time: int = 300,
+                             max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                             on_token: Optional[Callable[[str], None]] = None,
+                             source_strategy: Union[str, SourceStrategy] = DEFAULT_SOURCE_STRATEGY) -> str:
+        """
+        Asynchronous version of research() that fetches all sources concurrently
         
-        with WebBrowser(headless=self.headless, user_agent=self.user_agent) as browser:
-            # Use predefined sources instead of search
-            print(f"Using {depth} trusted sources for research...")
-            sources = RESEARCH_SOURCES[:depth]
+        Args:
+            topic: Research topic
+            depth: Number of sources to check
+            max_time: Maximum execution time in seconds
+            max_concurrency: Maximum number of sources fetched at once
+            on_token: Callback receiving report chunks as they are generated
+            source_strategy: 'trusted', 'search' or a callable(topic, depth, browser) returning URLs
             
-            for i, url in enumerate(sources, 1):
-                print(f"Processing source {i}/{len(sources)}: {url}")
-                # Check time limit
-                if time.time() - start_time > max_time:
-                    print("Time limit exceeded")
-                    all_content.append({
-                        "url": "Time limit exceeded",
-                        "content": "Research was interrupted due to time limit"
-                    })
-                    break
+        Returns:
+            str: Research results
+        """
+        if isinstance(source_strategy, str):
+            name = source_strategy.lower()
+            if name not in SOURCE_STRATEGIES:
+                raise ValueError(f"Unknown source strategy: {source_strategy}")
+            print(f"Using '{name}' strategy to pick {depth} sources...")
+            source_strategy = SOURCE_STRATEGIES[name]
+        
+        summary_prompt = f"""
+        You are a research assistant. Summarize the key facts, figures and expert opinions
+        from the provided source that are relevant to "{topic}". Be concise.
+        """
+        source_budget = PROMPT_TOKEN_BUDGET - count_tokens(summary_prompt)
+        
+        # Scrapers put extracted pages on the queue and the summarizer starts an
+        # LLM call for each one right away, so summaries overlap remaining scrapes
+        queue: asyncio.Queue = asyncio.Queue()
+        summaries: Dict[int, asyncio.Future] = {}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # One deadline covers picking sources, scraping and summarizing
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_time
+        timed_out = False
+        
+        def remaining() -> float:
+            return max(0.0, deadline - loop.time())
+        
+        async with self.llm_provider.async_session() as generate:
+            async with AsyncWebBrowser(headless=self.headless, user_agent=self.user_agent) as browser:
+                # Strategies share the research browser, so a search doesn't start another Chromium
+                sources = source_strategy(topic, depth, browser)
+                if inspect.isawaitable(sources):
+                    try:
+                        sources = await asyncio.wait_for(sources, timeout=remaining())
+                    except asyncio.TimeoutError:
+                        sources, timed_out = [], True
+                sources = list(sources)[:depth]
                 
-                # Navigate to source
-                print(f"Navigating to {url}")
-                if browser.navigate(url):
-                    # Extract content
-                    print("Extracting content...")
-                    content = browser.extract_content()
-                    all_content.append({
-                        "url": url,
-                        "content": content
-                    })
-                else:
-                    print(f"Failed to navigate to {url}")
-            
-            print("Preparing research report...")
-            # Form system prompt for research
-            system_prompt = f"""
-            You are an experienced researcher and technology analyst. Analyze the provided information about "{topic}".
-            Create a structured report in Ukrainian language including:
-            1. Key facts and data about AI in design and product development
-            2. Expert opinions and predictions for 2025
-            3. Current trends and potential impact
-            4. Conclusions and recommendations
-            
-            Base your analysis on the available information, even if it's not directly about the specific question.
-            Extrapolate current trends and developments to make informed predictions about 2025.
-            """
-            
-            # Form user prompt with data from all sources
-            user_prompt = f"Research topic: {topic}\n\n"
-            
-            for i, source in enumerate(all_content):
-                user_prompt += f"--- SOURCE {i+1}: {source.get('url', 'URL not specified')} ---\n"
+                async def scrape(i: int, url: str):
+                    async with semaphore:
+                        print(f"Processing source {i + 1}/{len(sources)}: {url}")
+                        try:
+                            content = await browser.fetch(url)
+                        except Exception:
+                            content = None
+                    await queue.put((i, content))
                 
-                if isinstance(source['content'], dict) and 'content' in source['content']:
-                    # Add headers
-                    if 'headers' in source['content']['content']:
-                        headers = source['content']['content']['headers'][:8]
-                        user_prompt += "Main headers:\n"
-                        user_prompt += "\n".join([f"- {h}" for h in headers])
-                        user_prompt += "\n\n"
-                    
-                    # Add paragraphs
-                    if 'paragraphs' in source['content']['content']:
-                        paragraphs = source['content']['content']['paragraphs'][:10]
-                        user_prompt += "Key excerpts:\n"
-                        user_prompt += "\n\n".join(paragraphs[:500])  # Limit size
-                        user_prompt += "\n\n"
-                else:
-                    user_prompt += "Failed to extract structured content\n\n"
+                async def summarize():
+                    while True:
+                        item = await queue.get()
+                        if item is None:
+                            return
+                        i, content = item
+                        block = None
+                        if content:
+                            block = self._format_source({"url": sources[i], "content": content}, source_budget)
+                        if block is None:
+                            print(f"Failed to navigate to {sources[i]}")
+                            continue
+                        print(f"Summarizing source {i + 1}: {sources[i]}")
+                        summaries[i] = asyncio.ensure_future(generate(summary_prompt, block))
                 
-                user_prompt += "---\n\n"
+                summarizer = asyncio.ensure_future(summarize())
+                tasks = [asyncio.ensure_future(scrape(i, url)) for i, url in enumerate(sources)]
+                # Partial results are kept if the time limit is hit
+                done, pending = await asyncio.wait(tasks, timeout=remaining()) if tasks else (set(), set())
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                timed_out = timed_out or bool(pending)
+                await queue.put(None)
+                await summarizer
             
-            print("Generating final report...")
-            # Generate final report
-            response = self.llm_provider.generate_response(system_prompt, user_prompt)
-            return response
\ No newline at end of file
+            print("Waiting for source summaries...")
+            if summaries:
+                done, pending = await asyncio.wait(summaries.values(), timeout=remaining())
+                # Summaries that don't finish in time are dropped
+                for future in pending:
+                    future.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                timed_out = timed_out or bool(pending)
+            summary_texts = {}
+            for i, future in summaries.items():
+                if future.cancelled():
+                    continue
+                # A failed LLM call is skipped like a failed scrape, not passed on as source text
+                if future.exception() is not None:
+                    print(f"Failed to summarize {sources[i]}: {future.exception()}")
+                    continue
+                summary_texts[i] = future.result()
+        
+        print("Preparing research report...")
+        # Form system prompt for research
+        system_prompt = f"""
+        You are an experienced researcher and technology analyst. Analyze the provided information about "{topic}".
+        Create a structured report in Ukrainian language including:
+        1. Key facts and data about AI in design and product development
+        2. Expert opinions and predictions for 2025
+        3. Current trends and potential impact
+        4. Conclusions and recommendations
+        
+        Base your analysis on the available information, even if it's not directly about the specific question.
+        Extrapolate current trends and developments to make informed predictions about 2025.
+        """
+        
+        # Form user prompt with summaries of all sources, in the original order
+        parts = [f"Research topic: {topic}\n\n"]
+        
+        for i, index in enumerate(sorted(summary_texts)):
+            parts.append(f"--- SOURCE {i+1}: {sources[index]} ---\n")
+            parts.append(summary_texts[index])
+            parts.append("\n\n---\n\n")
+        
+        if timed_out:
+            print("Time limit exceeded")
+            parts.append(f"--- SOURCE {len(summary_texts) + 1}: Time limit exceeded ---\n")
+            parts.append("Failed to extract structured content\n\n---\n\n")
+        
+        user_prompt = "".join(parts)
+        
+        print("Generating final report...")
+        # Generate final report in a worker thread, the blocking call would hold the loop
+        return await loop.run_in_executor(None, self._generate, system_prompt, user_prompt, on_token)
+    
+    @staticmethod
+    def _format_source(source: Dict[str, Any], max_tokens: int) -> Optional[str]:
+        """Formats extracted source content within max_tokens, None if nothing was extracted"""
+        if not (isinstance(source['content'], dict) and 'content' in source['content']):
+            return None
+        
+        parts = []
+        # Add headers
+        if 'headers' in source['content']['content']:
+            headers = source['content']['content']['headers'][:8]
+            parts.append("Main headers:\n")
+            parts.append("\n".join([f"- {h}" for h in headers]))
+            parts.append("\n\n")
+        
+        # Add paragraphs within the remaining token budget
+        if 'paragraphs' in source['content']['content']:
+            parts.append("Key excerpts:\n")
+            budget = max_tokens - count_tokens("".join(parts))
+            paragraphs = pack(source['content']['content']['paragraphs'], budget)
+            parts.append("\n\n".join(paragraphs))
+            parts.append("\n\n")
+        
+        return "".join(parts)
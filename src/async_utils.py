@@ -0,0 +1,24 @@
+"""
+Helpers for running coroutines from synchronous code
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Runs a coroutine to completion and returns its result
+
+    asyncio.run() refuses to start while the thread already has a running loop,
+    which is the case after the sync Playwright driver has started (or inside
+    Jupyter), so the coroutine then gets its own loop in a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
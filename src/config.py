@@ -0,0 +1,15 @@
+"""
+Environment configuration loading
+"""
+_env_loaded = False
+
+
+def load_env():
+    """Load variables from .env once; later calls do nothing"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    
+    from dotenv import load_dotenv
+    load_dotenv()
@@ -0,0 +1,113 @@
+"""
+Lightweight HTTP fetching for pages that don't need JavaScript rendering
+"""
+from itertools import islice
+from typing import Dict, List, Any, Optional
+
+import httpx
+from selectolax.lexbor import LexborHTMLParser, SelectolaxError
+
+# Settings shared by the sync and async HTTP clients
+CLIENT_OPTIONS = {
+    "http2": True,
+    "follow_redirects": True,
+    "timeout": 15,
+    "headers": {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "uk,en-US;q=0.7,en;q=0.3"
+    }
+}
+# Caps on extracted text shared by the HTTP and browser paths; sized above what
+# the agent's prompt token budget can use
+EXTRACT_LIMITS = {"headerLimit": 10, "paraLimit": 40, "charLimit": 1000}
+
+_client: Optional[httpx.Client] = None
+
+
+def get_client() -> httpx.Client:
+    """Return a shared HTTP/2 client, created on first use"""
+    global _client
+    if _client is None:
+        _client = httpx.Client(**CLIENT_OPTIONS)
+    return _client
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """Create an HTTP/2 client for use within one event loop"""
+    return httpx.AsyncClient(**CLIENT_OPTIONS)
+
+
+def _select(tree: LexborHTMLParser, selectors: List[str]):
+    """Yield nodes matching each selector in turn, skipping nodes an earlier one matched"""
+    seen = set()
+    for selector in selectors:
+        try:
+            nodes = tree.css(selector)
+        except SelectolaxError:
+            # Like the in-page extractor, an invalid selector only loses its own matches
+            continue
+        for node in nodes:
+            if node.mem_id not in seen:
+                seen.add(node.mem_id)
+                yield node
+
+
+def _texts(nodes, limit: Optional[int], char_limit: Optional[int]) -> List[str]:
+    """Take the non-empty text of up to limit nodes, each cut to char_limit characters"""
+    texts = (text for node in nodes if (text := node.text().strip()))
+    return [text[:char_limit] for text in islice(texts, limit)]
+
+
+def parse_html(html: str, url: str, header_selectors: List[str],
+               content_selectors: List[str],
+               limits: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Extract headers and paragraphs from raw HTML using CSS selectors and optional size limits"""
+    tree = LexborHTMLParser(html)
+    limits = limits or {}
+
+    # Matches keep the selector priority order, so <p> excerpts come before a
+    # whole <article> that repeats them; empty elements are skipped
+    headers = _texts(_select(tree, header_selectors),
+                     limits.get("headerLimit"), limits.get("charLimit"))
+    paragraphs = _texts(_select(tree, content_selectors),
+                        limits.get("paraLimit"), limits.get("charLimit"))
+
+    return {
+        "url": url,
+        "content": {
+            "headers": headers,
+            "paragraphs": paragraphs
+        }
+    }
+
+
+def fast_fetch(url: str, header_selectors: List[str], content_selectors: List[str],
+               user_agent: str) -> Optional[Dict[str, Any]]:
+    """Fetch a page over plain HTTP and extract its content, None on failure"""
+    try:
+        response = get_client().get(url, headers={"User-Agent": user_agent})
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+
+    try:
+        return parse_html(response.text, str(response.url), header_selectors, content_selectors,
+                          EXTRACT_LIMITS)
+    except Exception:
+        return None
+
+
+async def fast_fetch_async(client: httpx.AsyncClient, url: str, header_selectors: List[str],
+                           content_selectors: List[str], user_agent: str) -> Optional[Dict[str, Any]]:
+    """Asynchronous version of fast_fetch() using the given client"""
+    try:
+        response = await client.get(url, headers={"User-Agent": user_agent})
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+
+    try:
+        return parse_html(response.text, str(response.url), header_selectors, content_selectors,
+                          EXTRACT_LIMITS)
+    except Exception:
+        return None
@@ -0,0 +1,63 @@
+"""
+Persistent caching of LLM responses
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+def make_key(provider: str, model: str, system_prompt: str, user_prompt: str) -> str:
+    """Builds a cache key from provider, model and both prompts"""
+    raw = f"{provider}|{model}|{system_prompt}|{user_prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class BaseCache(ABC):
+    """Abstract base class for LLM response caches"""
+
+    @abstractmethod
+    def lookup(self, key: str) -> Optional[str]:
+        """Returns the cached response for key or None"""
+        pass
+
+    @abstractmethod
+    def update(self, key: str, value: str) -> None:
+        """Stores a response under key"""
+        pass
+
+
+class DiskLLMCache(BaseCache):
+    """LLM response cache stored in a SQLite database"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, ts INTEGER)"
+            )
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Returns the cached response for key or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, key: str, value: str) -> None:
+        """Stores a response under key"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                (key, value, int(time.time()))
+            )
+
+
+def cache_from_env() -> Optional[BaseCache]:
+    """Creates a disk cache if LLM_CACHE_PATH is set"""
+    path = os.getenv("LLM_CACHE_PATH")
+    return DiskLLMCache(path) if path else None
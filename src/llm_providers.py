@@ -1,41 +1,187 @@
 """
 Module for working with various Language Model (LLM) providers
 """
-import json
-import requests
+import asyncio
+import httpx
+import orjson
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Dict, List, Any, Optional, Iterator, Tuple, AsyncIterator, Awaitable, Callable
 
-# Load environment variables
-load_dotenv()
+from src.async_utils import run_sync
+from src.llm_cache import BaseCache, make_key, cache_from_env
+
+# Maximum number of concurrent requests in generate_response_batch
+BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "8"))
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
-    @abstractmethod
+    name = "base"
+    model = ""
+    _session = None
+    
+    def __init__(self, cache: Optional[BaseCache] = None):
+        # Fall back to the LLM_CACHE_PATH disk cache when none is given
+        self.cache = cache if cache is not None else cache_from_env()
+    
+    @property
+    def session(self):
+        """Keep-alive requests session with the API headers, created on first use"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update(self._request_headers())
+        return self._session
+    
     def generate_response(self, system_prompt: str, user_prompt: str) -> str:
         """Generates a response based on system and user prompts"""
+        return "".join(self.generate_response_stream(system_prompt, user_prompt))
+    
+    def generate_response_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """Yields response text chunks as they arrive from the API"""
+        key = None
+        if self.cache is not None:
+            key = make_key(self.name, self.model, system_prompt, user_prompt)
+            cached = self.cache.lookup(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        import requests
+        
+        chunks = []
+        try:
+            for chunk in self._stream_api(system_prompt, user_prompt):
+                chunks.append(chunk)
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            # An error after partial output would be glued onto the answer
+            if not chunks:
+                yield f"API Error: {str(e)}"
+            return
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
+            if not chunks:
+                yield f"Response processing error: {str(e)}"
+            return
+        
+        # Errors are returned above and never cached
+        if key is not None:
+            self.cache.update(key, "".join(chunks))
+    
+    def _stream_api(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """Posts a streaming chat completion request and parses SSE chunks"""
+        data = self._build_payload(system_prompt, user_prompt)
+        data["stream"] = True
+        
+        with self.session.post(self.api_url, data=orjson.dumps(data), timeout=60, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                chunk = line[len(b"data: "):]
+                if chunk == b"[DONE]":
+                    break
+                # Usage and content-filter chunks come with an empty choices list
+                choices = orjson.loads(chunk).get("choices") or []
+                if not choices:
+                    continue
+                delta = choices[0].get("delta") or {}
+                if delta.get("content"):
+                    yield delta["content"]
+    
+    def generate_response_batch(self, pairs: List[Tuple[str, str]]) -> List[str]:
+        """Generates responses for several (system, user) prompt pairs concurrently"""
+        return run_sync(self.generate_response_batch_async(pairs))
+    
+    async def generate_response_batch_async(self, pairs: List[Tuple[str, str]]) -> List[str]:
+        """Asynchronous version of generate_response_batch()"""
+        async with self.async_session() as generate:
+            return await asyncio.gather(*[
+                self._error_as_text(generate(system_prompt, user_prompt))
+                for system_prompt, user_prompt in pairs
+            ])
+    
+    @staticmethod
+    async def _error_as_text(response: Awaitable[str]) -> str:
+        """Awaits a response, returning request and parsing failures as error text"""
+        try:
+            return await response
+        except httpx.HTTPError as e:
+            return f"API Error: {str(e)}"
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
+            return f"Response processing error: {str(e)}"
+    
+    @asynccontextmanager
+    async def async_session(self) -> AsyncIterator[Callable[[str, str], Awaitable[str]]]:
+        """
+        Opens a shared async client for issuing requests as they become ready
+        
+        Yields:
+            Coroutine function generate(system_prompt, user_prompt) -> str,
+            limited to BATCH_CONCURRENCY requests in flight; it raises
+            httpx.HTTPError or a parsing error instead of returning error text
+        """
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        async with httpx.AsyncClient(http2=True, timeout=60) as client:
+            yield partial(self._generate_async, client, semaphore)
+    
+    async def _generate_async(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                              system_prompt: str, user_prompt: str) -> str:
+        """Generates a single non-streaming response with the async client, raising on failure"""
+        key = None
+        if self.cache is not None:
+            key = make_key(self.name, self.model, system_prompt, user_prompt)
+            cached = self.cache.lookup(key)
+            if cached is not None:
+                return cached
+        
+        async with semaphore:
+            response = await client.post(
+                self.api_url,
+                headers=self._request_headers(),
+                content=orjson.dumps(self._build_payload(system_prompt, user_prompt))
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)["choices"][0]["message"]["content"]
+        
+        if key is not None:
+            self.cache.update(key, result)
+        return result
+    
+    def _request_headers(self) -> Dict[str, str]:
+        """Headers sent with every API request"""
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+    
+    @abstractmethod
+    def _build_payload(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Builds the chat completion request body"""
         pass
 
 
-def get_provider(provider_name: str = "grok", api_key: Optional[str] = None) -> LLMProvider:
+def get_provider(provider_name: str = "grok", api_key: Optional[str] = None,
+                 cache: Optional[BaseCache] = None) -> LLMProvider:
     """
     Creates and returns an LLM provider instance based on name
     
     Args:
         provider_name: Provider name ('grok' or 'openai')
         api_key: API key for the provider (optional)
+        cache: Response cache (optional, defaults to LLM_CACHE_PATH)
     
     Returns:
         LLMProvider: Instance of the corresponding provider
     """
     if provider_name.lower() == "grok":
-        return GrokProvider(api_key)
+        return GrokProvider(api_key, cache=cache)
     elif provider_name.lower() == "openai":
-        return OpenAIProvider(api_key)
+        return OpenAIProvider(api_key, cache=cache)
     else:
         raise ValueError(f"Unknown provider: {provider_name}")
 
@@ -43,20 +189,20 @@ def get_provider(provider_name: str = "grok", api_key: Optional[str] = None) ->
 class GrokProvider(LLMProvider):
     """Integration with Grok API (X.AI)"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    name = "grok"
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "grok-beta",
+                 cache: Optional[BaseCache] = None):
+        super().__init__(cache)
         self.api_key = api_key or os.getenv("GROK_API_KEY")
         if not self.api_key:
             raise ValueError("Grok API key is required. Provide it in parameters or in .env file")
         
+        self.model = model
         self.api_url = "https://api.x.ai/v1/chat/completions"
         
-    def generate_response(self, system_prompt: str, user_prompt: str) -> str:
-        """Generates a response using Grok API"""
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
+    def _build_payload(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Builds request body for Grok API"""
         data = {
             "messages": [
                 {
@@ -68,32 +214,20 @@ class GrokProvider(LLMProvider):
                     "content": user_prompt
                 }
             ],
-            "model": "grok-beta",
-            "stream": False,
+            "model": self.model,
             "temperature": 0
         }
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                data=json.dumps(data),
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        except requests.exceptions.RequestException as e:
-            return f"API Error: {str(e)}"
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
-            return f"Response processing error: {str(e)}"
+        return data
 
 
 class OpenAIProvider(LLMProvider):
     """Integration with OpenAI API"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    name = "openai"
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4",
+                 cache: Optional[BaseCache] = None):
+        super().__init__(cache)
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Provide it in parameters or in .env file")
@@ -101,13 +235,8 @@ class OpenAIProvider(LLMProvider):
         self.model = model
         self.api_url = "https://api.openai.com/v1/chat/completions"
         
-    def generate_response(self, system_prompt: str, user_prompt: str) -> str:
-        """Generates a response using OpenAI API"""
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
+    def _build_payload(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Builds request body for OpenAI API"""
         data = {
             "model": self.model,
             "messages": [
@@ -122,17 +251,4 @@ class OpenAIProvider(LLMProvider):
             ],
             "temperature": 0
         }
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                data=json.dumps(data),
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        except requests.exceptions.RequestException as e:
-            return f"API Error: {str(e)}"
\ No newline at end of file
+        return data
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Token-aware helpers for building LLM prompts
+"""
+import os
+from typing import List
+
+# Token budget for the user side of a single prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+# Rough characters-per-token ratio used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """Load the cl100k_base encoding once, None if tiktoken can't be used"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # Not installed or the encoding file can't be downloaded
+            _encoding = None
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Returns the number of tokens in text"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text down to at most max_tokens tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def pack(chunks: List[str], max_tokens: int) -> List[str]:
+    """
+    Greedily takes chunks while they fit into the token budget
+
+    Args:
+        chunks: Text pieces in priority order
+        max_tokens: Token budget for all returned chunks
+
+    Returns:
+        List[str]: Leading chunks that fit, the last one truncated if needed
+    """
+    packed = []
+    remaining = max_tokens
+    for chunk in chunks:
+        if remaining <= 0:
+            break
+        tokens = count_tokens(chunk)
+        if tokens > remaining:
+            packed.append(truncate_to_tokens(chunk, remaining))
+            break
+        packed.append(chunk)
+        remaining -= tokens
+    return packed
@@ -0,0 +1,89 @@
+"""
+Web search through structured search APIs
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import httpx
+
+from src.http_tools import get_client
+
+# Number of results requested from search APIs
+DEFAULT_RESULT_COUNT = 5
+
+
+class SearchProvider(ABC):
+    """Abstract base class for search API providers"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    def search(self, query: str, count: int = DEFAULT_RESULT_COUNT) -> List[str]:
+        """Returns result URLs for the query, empty list on failure"""
+        try:
+            return self._search(query, count)[:count]
+        except (httpx.HTTPError, ValueError, KeyError, TypeError):
+            return []
+
+    @abstractmethod
+    def _search(self, query: str, count: int) -> List[str]:
+        """Queries the API and returns result URLs"""
+        pass
+
+
+class BraveSearch(SearchProvider):
+    """Integration with Brave Search API"""
+
+    api_url = "https://api.search.brave.com/res/v1/web/search"
+
+    def _search(self, query: str, count: int) -> List[str]:
+        response = get_client().get(
+            self.api_url,
+            params={"q": query, "count": count},
+            headers={"X-Subscription-Token": self.api_key, "Accept": "application/json"}
+        )
+        response.raise_for_status()
+        return [result["url"] for result in response.json()["web"]["results"]]
+
+
+class SerperSearch(SearchProvider):
+    """Integration with Serper (Google Search) API"""
+
+    api_url = "https://google.serper.dev/search"
+
+    def _search(self, query: str, count: int) -> List[str]:
+        response = get_client().post(
+            self.api_url,
+            json={"q": query, "num": count},
+            headers={"X-API-KEY": self.api_key}
+        )
+        response.raise_for_status()
+        return [result["link"] for result in response.json()["organic"]]
+
+
+def get_search_provider(provider_name: str = "brave", api_key: Optional[str] = None) -> SearchProvider:
+    """
+    Creates and returns a search provider instance based on name
+
+    Args:
+        provider_name: Provider name ('brave' or 'serper')
+        api_key: API key for the provider
+
+    Returns:
+        SearchProvider: Instance of the corresponding provider
+    """
+    if provider_name.lower() == "brave":
+        return BraveSearch(api_key)
+    elif provider_name.lower() == "serper":
+        return SerperSearch(api_key)
+    else:
+        raise ValueError(f"Unknown search provider: {provider_name}")
+
+
+def search_provider_from_env() -> Optional[SearchProvider]:
+    """Creates the provider named by SEARCH_PROVIDER if SEARCH_API_KEY is set"""
+    api_key = os.getenv("SEARCH_API_KEY")
+    if not api_key:
+        return None
+    return get_search_provider(os.getenv("SEARCH_PROVIDER", "brave"), api_key)
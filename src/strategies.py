@@ -0,0 +1,33 @@
+"""
+Strategies for choosing research sources
+"""
+from typing import List
+
+from src.web_tools import AsyncWebBrowser
+
+# Reliable sources for AI and technology research
+RESEARCH_SOURCES = [
+    "https://www.wired.com/tag/artificial-intelligence",
+    "https://www.technologyreview.com/topic/artificial-intelligence",
+    "https://venturebeat.com/category/ai",
+    "https://www.reuters.com/technology",
+    "https://techcrunch.com/category/artificial-intelligence"
+]
+
+
+def trusted_sources(topic: str, depth: int, browser: AsyncWebBrowser) -> List[str]:
+    """Use the predefined list of trusted sources"""
+    return RESEARCH_SOURCES[:depth]
+
+
+async def search_sources(topic: str, depth: int, browser: AsyncWebBrowser) -> List[str]:
+    """Find sources by searching the web for the topic with the research browser"""
+    results = await browser.google_search(topic)
+    return results[:depth]
+
+
+# Built-in strategies available by name
+SOURCE_STRATEGIES = {
+    "trusted": trusted_sources,
+    "search": search_sources
+}
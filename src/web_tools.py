@@ -2,84 +2,354 @@
 Browser management and web interaction tools
 """
 import os
+import re
 import time
+import logging
+import atexit
+import threading
+import asyncio
 import random
-from typing import Dict, List, Any, Optional
-from playwright.sync_api import sync_playwright
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Union, AbstractSet, AsyncIterator
+from urllib.parse import urlsplit, quote_plus
 
-# Load environment variables
-load_dotenv()
+from src.http_tools import EXTRACT_LIMITS, fast_fetch, fast_fetch_async, create_async_client, parse_html
+from src.search import search_provider_from_env
+
+log = logging.getLogger(__name__)
 
 # Default values
 DEFAULT_TIMEOUT = int(os.getenv("DEFAULT_TIMEOUT", "30"))
 DEFAULT_HEADERS = ["h1", "h2", "h3"]
 DEFAULT_CONTENT = ["p", "article"]
 DEFAULT_USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+# Plain HTTP result is used when its paragraphs hold at least this many characters
+FAST_FETCH_MIN_CHARS = int(os.getenv("FAST_FETCH_MIN_CHARS", "1500"))
+# Connect to an already running Chromium (e.g. ws://host:9222/...) instead of launching one
+CDP_ENDPOINT = os.getenv("CDP_ENDPOINT")
+# Clean pages opened ahead of time for each WebBrowser session
+PAGE_POOL_SIZE = 2
+
+# Browser launch and context settings shared by sync and async browsers
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage"
+]
+# Only headers Chromium doesn't set itself, so it keeps negotiating Accept/Accept-Encoding (brotli)
+EXTRA_HTTP_HEADERS = {
+    "Accept-Language": "uk,en-US;q=0.7,en;q=0.3",
+    "DNT": "1"
+}
+
+
+# Resource types that are not needed for text extraction, blocked by default
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "amazon-adsystem.com",
+    "scorecardresearch.com",
+    "taboola.com",
+    "outbrain.com",
+    "criteo.com"
+)
+
+# Runs inside the page and collects all header/paragraph text in one call,
+# applying EXTRACT_LIMITS there so discarded text never crosses the CDP bridge
+EXTRACT_CONTENT_JS = """
+(sels) => {
+    const limits = sels.limits || {};
+    // Matches keep the selector priority order, so <p> excerpts come before a
+    // whole <article> that repeats them; elements matched twice are skipped
+    function* match(selectors) {
+        const seen = new Set();
+        for (const s of selectors) {
+            let nodes;
+            try { nodes = document.querySelectorAll(s); } catch (e) { continue; }
+            for (const e of nodes) {
+                if (seen.has(e)) continue;
+                seen.add(e);
+                yield e;
+            }
+        }
+    }
+    const grab = (selectors, limit) => {
+        const out = [];
+        for (const e of match(selectors)) {
+            if (out.length >= limit) break;
+            // Empty elements would only use up the limit
+            const text = (e.textContent || "").trim();
+            if (text) out.push(text.slice(0, limits.charLimit));
+        }
+        return out;
+    };
+    return {
+        headers: grab(sels.headers, limits.headerLimit),
+        paragraphs: grab(sels.content, limits.paraLimit)
+    };
+}
+"""
+
+
+# Search result links and the in-page filter returning their absolute URLs
+SEARCH_URL = "https://duckduckgo.com/?q={query}"
+SEARCH_RESULT_LINKS = "article.result a.result__a"
+EXTRACT_LINKS_JS = "els => els.map(e => e.getAttribute('href')).filter(h => h && h.startsWith('http'))"
+
+
+# Site-specific settings for known news sites, matched against the URL host;
+# content selectors target paragraphs, since EXTRACT_LIMITS caps each match and a
+# whole article container would be cut to its opening characters;
+# "javascript": False marks server-rendered sites loaded with scripts disabled
+DOMAIN_CONFIG = {
+    "bbc.com": {"content": ["article p", ".article__body-content p"], "javascript": False},
+    "bbc.co.uk": {"content": ["article p", ".article__body-content p"], "javascript": False},
+    "reuters.com": {"content": ["article p", ".article-body p"], "javascript": False},
+    "bloomberg.com": {"content": ["article p", ".body-content p"], "javascript": False}
+}
+
+
+# Matches a DOMAIN_CONFIG key or any of its subdomains at the end of a host
+SITE_RE = re.compile(r"(?:^|\.)(" + "|".join(map(re.escape, DOMAIN_CONFIG)) + r")$")
+
+
+def match_domain(url: str) -> Optional[str]:
+    """Return the DOMAIN_CONFIG key matching the URL host, if any"""
+    match = SITE_RE.search(urlsplit(url).hostname or "")
+    return match.group(1) if match else None
+
+
+def needs_javascript(domain: Optional[str]) -> bool:
+    """Check whether pages of a DOMAIN_CONFIG key (or unknown site) need scripts to render"""
+    return domain is None or DOMAIN_CONFIG[domain].get("javascript", True)
+
+
+def has_enough_content(result: Optional[Dict[str, Any]]) -> bool:
+    """Check whether a fast_fetch() result has enough text to skip the browser"""
+    # Measured in text rather than elements, since selectors may match few large blocks
+    return bool(result) and sum(map(len, result["content"]["paragraphs"])) >= FAST_FETCH_MIN_CHARS
+
+
+def context_options(user_agent: str, java_script_enabled: bool = True) -> Dict[str, Any]:
+    """Build keyword arguments for browser.new_context()"""
+    return {
+        "user_agent": user_agent,
+        "java_script_enabled": java_script_enabled,
+        "viewport": {"width": 1920, "height": 1080},
+        "locale": "uk-UA",
+        "timezone_id": "Europe/Kiev",
+        "extra_http_headers": EXTRA_HTTP_HEADERS
+    }
+
+
+def should_block(request, resource_types: AbstractSet[str]) -> bool:
+    """Check whether a request is a blocked resource type or goes to an ad/tracker host"""
+    if request.resource_type in resource_types:
+        return True
+    host = urlsplit(request.url).hostname or ""
+    return any(host == blocked or host.endswith("." + blocked) for blocked in BLOCKED_HOSTS)
+
+
+def resource_blocker(resource_types: AbstractSet[str]):
+    """Build a route handler for sync contexts"""
+    def handler(route):
+        if should_block(route.request, resource_types):
+            route.abort()
+        else:
+            route.continue_()
+    return handler
+
+
+def resource_blocker_async(resource_types: AbstractSet[str]):
+    """Build a route handler for async contexts"""
+    async def handler(route):
+        if should_block(route.request, resource_types):
+            await route.abort()
+        else:
+            await route.continue_()
+    return handler
+
+
+# Sync Playwright objects only work on the thread that created them, so the
+# driver and the pooled browsers are kept per thread
+_local = threading.local()
+
+
+def _get_pw():
+    """Return this thread's Playwright driver, starting it on first use"""
+    pw = getattr(_local, "pw", None)
+    if pw is None:
+        # Imported lazily to keep package import cheap
+        from playwright.sync_api import sync_playwright
+        pw = _local.pw = sync_playwright().start()
+    return pw
+
+
+def _stop_pw():
+    """Stop this thread's Playwright driver, the main thread's at interpreter exit"""
+    pw = getattr(_local, "pw", None)
+    if pw is not None:
+        try:
+            pw.stop()
+        except Exception:
+            pass
+        _local.pw = None
+
+
+# Registered before BrowserPool.shutdown so it runs after it
+atexit.register(_stop_pw)
+
+
+class BrowserPool:
+    """Pool that launches Chromium once per thread and hands out isolated contexts"""
+    
+    @staticmethod
+    def _browsers() -> Dict[bool, Any]:
+        """Return the current thread's browsers by headless mode"""
+        if not hasattr(_local, "browsers"):
+            _local.browsers = {}
+        return _local.browsers
+    
+    @classmethod
+    def acquire(cls, headless: bool = True, user_agent: Optional[str] = None,
+                block_resources: AbstractSet[str] = BLOCKED_RESOURCE_TYPES,
+                java_script_enabled: bool = True):
+        """Return a fresh browser context from the shared browser for this headless mode"""
+        browsers = cls._browsers()
+        browser = browsers.get(headless)
+        if browser is not None and not browser.is_connected():
+            # Chromium crashed or the CDP browser restarted, so launch or connect again
+            del browsers[headless]
+            browser = None
+        if browser is None:
+            if CDP_ENDPOINT:
+                browser = _get_pw().chromium.connect_over_cdp(CDP_ENDPOINT)
+            else:
+                browser = _get_pw().chromium.launch(headless=headless, args=LAUNCH_ARGS)
+            browsers[headless] = browser
+        context = browser.new_context(
+            **context_options(user_agent or DEFAULT_USER_AGENT, java_script_enabled)
+        )
+        context.route("**/*", resource_blocker(block_resources))
+        return context
+    
+    @classmethod
+    def release(cls, context):
+        """Return a context to the pool, closing it but keeping the browser running"""
+        try:
+            context.close()
+        except Exception:
+            pass
+    
+    @classmethod
+    def shutdown(cls):
+        """Close the current thread's browsers, leaving the Playwright driver running"""
+        # For a CDP browser close() only disconnects, the shared process keeps running
+        browsers = cls._browsers()
+        for browser in browsers.values():
+            try:
+                browser.close()
+            except Exception:
+                continue
+        browsers.clear()
+
+
+atexit.register(BrowserPool.shutdown)
 
 
 class WebBrowser:
     """Class for managing browser and web interactions"""
     
-    def __init__(self, headless: bool = True, user_agent: Optional[str] = None):
+    def __init__(self, headless: bool = True, user_agent: Optional[str] = None,
+                 block_resources: AbstractSet[str] = BLOCKED_RESOURCE_TYPES,
+                 emulate_human_behavior: bool = False):
         self.headless = headless
         self.user_agent = user_agent or DEFAULT_USER_AGENT
+        self.block_resources = block_resources
+        self.emulate_human_behavior = emulate_human_behavior
+        self.search_provider = search_provider_from_env()
         self.browser = None
         self.context = None
         self.page = None
+        self._page_pool = []
+        self._static_context = None
+        self._static_page = None
     
     def __enter__(self):
         """Initialization when entering context manager"""
-        playwright = sync_playwright().start()
-        self.browser = playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-features=IsolateOrigins,site-per-process",
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage"
-            ]
-        )
-        self.context = self.browser.new_context(
-            user_agent=self.user_agent,
-            viewport={"width": 1920, "height": 1080},
-            locale="uk-UA",
-            timezone_id="Europe/Kiev",
-            extra_http_headers={
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                "Accept-Language": "uk,en-US;q=0.7,en;q=0.3",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "none",
-                "Sec-Fetch-User": "?1",
-                "Pragma": "no-cache",
-                "Cache-Control": "no-cache"
-            }
-        )
-        self.page = self.context.new_page()
+        self.context = BrowserPool.acquire(self.headless, self.user_agent, self.block_resources)
+        self.browser = self.context.browser
+        # Pre-warm pages so operations can start from a clean one without waiting
+        self._page_pool = [self.context.new_page() for _ in range(PAGE_POOL_SIZE)]
+        self.page = self._acquire_page()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Cleanup when exiting context manager"""
-        if self.page:
-            self.page.close()
         if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
+            BrowserPool.release(self.context)
+            self.context = None
+            self.page = None
+            self._page_pool = []
+        if self._static_context:
+            BrowserPool.release(self._static_context)
+            self._static_context = None
+            self._static_page = None
     
-    def navigate(self, url: str):
-        """Navigate to specified URL"""
+    def _acquire_page(self):
+        """Take a clean page from the pool, opening a new one if it's empty"""
+        return self._page_pool.pop() if self._page_pool else self.context.new_page()
+    
+    def _release_page(self, page):
+        """Reset a page to about:blank and return it to the pool"""
         try:
-            self.page.goto(url, timeout=DEFAULT_TIMEOUT * 1000)
-            return True
+            page.goto("about:blank")
+            self._page_pool.append(page)
+        except Exception:
+            try:
+                page.close()
+            except Exception:
+                pass
+    
+    def _get_static_page(self):
+        """Return the page of the JS-disabled context, creating both on first use"""
+        if self._static_context is None:
+            self._static_context = BrowserPool.acquire(
+                self.headless, self.user_agent, self.block_resources, java_script_enabled=False
+            )
+            self._static_page = self._static_context.new_page()
+        return self._static_page
+    
+    @contextmanager
+    def _clean_page(self, javascript: bool = True):
+        """Run an operation on a pooled clean page, restoring self.page afterwards"""
+        previous = self.page
+        page = self.page = self._acquire_page() if javascript else self._get_static_page()
+        try:
+            yield page
+        finally:
+            self.page = previous
+            if javascript:
+                self._release_page(page)
+    
+    def navigate(self, url: str, emulate: bool = True):
+        """Navigate to specified URL, emulating a visitor if enabled for this browser"""
+        try:
+            self.page.goto(url, timeout=DEFAULT_TIMEOUT * 1000, wait_until="domcontentloaded")
         except Exception:
             return False
+        if emulate and self.emulate_human_behavior:
+            try:
+                self.emulate_human()
+            except Exception:
+                pass
+        return True
     
     def emulate_human(self):
         """Emulate human behavior to bypass bot detection"""
@@ -97,82 +367,105 @@ class WebBrowser:
         )
     
     def extract_content(self, header_selectors: List[str] = None, 
-                       content_selectors: List[str] = None) -> Dict[str, Any]:
-        """Extract content from page using specified selectors"""
+                       content_selectors: List[str] = None,
+                       limits: Dict[str, int] = EXTRACT_LIMITS) -> Dict[str, Any]:
+        """Extract content from page using specified selectors and size limits"""
         if not header_selectors:
             header_selectors = DEFAULT_HEADERS
         if not content_selectors:
             content_selectors = DEFAULT_CONTENT
             
-        # Extract text by selectors
-        headers = []
-        for selector in header_selectors:
-            try:
-                elements = self.page.query_selector_all(selector)
-                headers.extend([el.text_content().strip() for el in elements])
-            except Exception:
-                continue
-                
-        paragraphs = []
-        for selector in content_selectors:
-            try:
-                elements = self.page.query_selector_all(selector)
-                paragraphs.extend([el.text_content().strip() for el in elements])
-            except Exception:
-                continue
+        # Extract text by selectors in a single round-trip
+        try:
+            data = self.page.evaluate(
+                EXTRACT_CONTENT_JS,
+                {"headers": header_selectors, "content": content_selectors, "limits": limits}
+            )
+        except Exception:
+            data = {"headers": [], "paragraphs": []}
                 
         return {
             "url": self.page.url,
-            "content": {
-                "headers": headers,
-                "paragraphs": paragraphs
-            }
+            "content": data
         }
     
+    def parse_content(self, header_selectors: List[str], content_selectors: List[str],
+                      limits: Dict[str, int] = EXTRACT_LIMITS) -> Dict[str, Any]:
+        """Extract content by parsing the page HTML locally instead of querying the live DOM"""
+        try:
+            return parse_html(self.page.content(), self.page.url,
+                              header_selectors, content_selectors, limits)
+        except Exception:
+            return {
+                "url": self.page.url,
+                "content": {"headers": [], "paragraphs": []}
+            }
+    
+    def fetch(self, url: str, header_selectors: List[str] = None,
+              content_selectors: List[str] = None,
+              emulate: bool = True,
+              javascript: bool = True,
+              local_parse: bool = False) -> Optional[Dict[str, Any]]:
+        """Get page content over plain HTTP, falling back to a clean browser page, None on failure"""
+        header_selectors = header_selectors or DEFAULT_HEADERS
+        content_selectors = content_selectors or DEFAULT_CONTENT
+        
+        result = fast_fetch(url, header_selectors, content_selectors, self.user_agent)
+        if has_enough_content(result):
+            return result
+        
+        # A page (and the JS-disabled context) is only checked out once HTTP wasn't enough
+        with self._clean_page(javascript):
+            if not self.navigate(url, emulate):
+                return None
+            if local_parse:
+                return self.parse_content(header_selectors, content_selectors)
+            return self.extract_content(header_selectors, content_selectors)
+    
     def google_search(self, query: str) -> List[str]:
-        """Perform search using DuckDuckGo and return results"""
+        """Perform search using a search API or DuckDuckGo and return results"""
+        if self.search_provider is not None:
+            results = self.search_provider.search(query)
+            if results:
+                return results
+            log.debug("Search API returned no results, falling back to DuckDuckGo...")
+        
+        # Search on a clean page so later navigation doesn't start from DuckDuckGo
+        with self._clean_page():
+            return self._search_duckduckgo(query)
+    
+    def _search_duckduckgo(self, query: str) -> List[str]:
+        """Search DuckDuckGo in the current page and return result URLs"""
         try:
-            print("Navigating to DuckDuckGo...")
-            self.navigate("https://duckduckgo.com/")
-            
-            print("Waiting for page load...")
-            self.page.wait_for_load_state("networkidle", timeout=60000)
-            
-            print("Looking for search input...")
-            search_input = self.page.wait_for_selector('input[name="q"]', timeout=60000)
-            if not search_input:
-                print("Could not find search input")
-                return []
-            
-            print("Entering search query...")
-            search_input.fill(query)
-            search_input.press("Enter")
+            # Open the results page directly instead of typing into the landing page
+            log.debug("Navigating to DuckDuckGo...")
+            self.navigate(SEARCH_URL.format(query=quote_plus(query)), emulate=False)
             
-            print("Waiting for search results...")
-            self.page.wait_for_load_state("networkidle", timeout=60000)
+            log.debug("Waiting for search results...")
+            self.page.wait_for_selector("article.result", timeout=15000, state="attached")
             
             # Extract results
-            print("Extracting results...")
-            results = []
-            for result in self.page.query_selector_all("article.result"):
-                try:
-                    link = result.query_selector("a.result__a")
-                    if link and link.get_attribute("href"):
-                        url = link.get_attribute("href")
-                        if url.startswith("http"):
-                            results.append(url)
-                except Exception:
-                    continue
+            log.debug("Extracting results...")
+            results = self.page.eval_on_selector_all(SEARCH_RESULT_LINKS, EXTRACT_LINKS_JS)
             
-            print(f"Found {len(results)} results")
+            log.info("Found %d results", len(results))
             return results[:5]  # Return top 5 results
         except Exception as e:
-            print(f"Error during search: {str(e)}")
+            log.warning("Error during search: %s", e)
             return []
     
     def visit_news_site(self, url: str) -> Dict[str, Any]:
         """Visit news site and collect content"""
-        if not self.navigate(url):
+        # Site-specific selectors
+        key = match_domain(url)
+        content_selectors = DOMAIN_CONFIG[key]["content"] if key else DEFAULT_CONTENT
+            
+        # Known sites are scraped with tuned selectors, so only unknown ones get emulation;
+        # without scripts the DOM is the served HTML, so it's parsed locally in one CDP call
+        javascript = needs_javascript(key)
+        result = self.fetch(url, DEFAULT_HEADERS, content_selectors, emulate=key is None,
+                            javascript=javascript, local_parse=not javascript)
+        if result is None:
             return {
                 "url": url,
                 "content": {
@@ -180,19 +473,250 @@ class WebBrowser:
                     "paragraphs": []
                 }
             }
-            
-        # Define selectors based on site
-        header_selectors = DEFAULT_HEADERS
-        content_selectors = DEFAULT_CONTENT
+        return result
+
+
+class AsyncWebBrowser:
+    """Asynchronous browser for fetching several pages concurrently"""
+    
+    def __init__(self, headless: bool = True, user_agent: Optional[str] = None,
+                 block_resources: AbstractSet[str] = BLOCKED_RESOURCE_TYPES,
+                 emulate_human_behavior: bool = False):
+        self.headless = headless
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        self.block_resources = block_resources
+        self.emulate_human_behavior = emulate_human_behavior
+        self.search_provider = search_provider_from_env()
+        self.playwright = None
+        self.browser = None
+        self.http_client = None
+        self._launch_lock = None
+    
+    async def __aenter__(self):
+        """Initialization when entering async context manager"""
+        # Chromium is launched on first use, so HTTP-only work never starts it
+        self._launch_lock = asyncio.Lock()
+        self.http_client = create_async_client()
+        return self
+    
+    async def get_browser(self):
+        """Return the browser, launching it on first call"""
+        async with self._launch_lock:
+            if self.browser is None:
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+                if CDP_ENDPOINT:
+                    self.browser = await self.playwright.chromium.connect_over_cdp(CDP_ENDPOINT)
+                else:
+                    self.browser = await self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        return self.browser
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Cleanup when exiting async context manager"""
+        if self.http_client:
+            await self.http_client.aclose()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+    
+    async def navigate(self, page, url: str, emulate: bool = True) -> bool:
+        """Navigate page to specified URL, emulating a visitor if enabled for this browser"""
+        # Human emulation pauses overlap with the page load instead of following it
+        emulation = None
+        if emulate and self.emulate_human_behavior:
+            emulation = asyncio.ensure_future(self.emulate_human(page))
+        try:
+            await page.goto(url, timeout=DEFAULT_TIMEOUT * 1000, wait_until="domcontentloaded")
+            return True
+        except Exception:
+            return False
+        finally:
+            if emulation is not None:
+                await asyncio.gather(emulation, return_exceptions=True)
+    
+    async def emulate_human(self, page):
+        """Emulate human behavior without blocking the event loop"""
+        # Random pause
+        await asyncio.sleep(random.uniform(1, 3))
+        
+        # Random scrolling
+        await page.mouse.wheel(0, random.randint(300, 700))
+        await asyncio.sleep(random.uniform(0.5, 1.5))
+        
+        # Random mouse movement
+        await page.mouse.move(
+            random.randint(100, 500),
+            random.randint(100, 500)
+        )
+    
+    async def extract_content(self, page, header_selectors: List[str] = None,
+                              content_selectors: List[str] = None,
+                              limits: Dict[str, int] = EXTRACT_LIMITS) -> Dict[str, Any]:
+        """Extract content from page using specified selectors and size limits"""
+        if not header_selectors:
+            header_selectors = DEFAULT_HEADERS
+        if not content_selectors:
+            content_selectors = DEFAULT_CONTENT
+        
+        try:
+            data = await page.evaluate(
+                EXTRACT_CONTENT_JS,
+                {"headers": header_selectors, "content": content_selectors, "limits": limits}
+            )
+        except Exception:
+            data = {"headers": [], "paragraphs": []}
         
-        domain = url.split("//")[-1].split("/")[0]
+        return {
+            "url": page.url,
+            "content": data
+        }
+    
+    async def parse_content(self, page, header_selectors: List[str], content_selectors: List[str],
+                            limits: Dict[str, int] = EXTRACT_LIMITS) -> Dict[str, Any]:
+        """Extract content by parsing the page HTML locally instead of querying the live DOM"""
+        try:
+            return parse_html(await page.content(), page.url,
+                              header_selectors, content_selectors, limits)
+        except Exception:
+            return {
+                "url": page.url,
+                "content": {"headers": [], "paragraphs": []}
+            }
+    
+    async def fetch(self, url: str, header_selectors: List[str] = None,
+                    content_selectors: List[str] = None,
+                    emulate: bool = True,
+                    javascript: bool = True,
+                    local_parse: bool = False) -> Optional[Dict[str, Any]]:
+        """Get page content over plain HTTP, falling back to an isolated browser context"""
+        header_selectors = header_selectors or DEFAULT_HEADERS
+        content_selectors = content_selectors or DEFAULT_CONTENT
         
+        result = await fast_fetch_async(
+            self.http_client, url, header_selectors, content_selectors, self.user_agent
+        )
+        if has_enough_content(result):
+            return result
+        
+        context = await self.new_context(javascript)
+        try:
+            page = await context.new_page()
+            if not await self.navigate(page, url, emulate):
+                return None
+            if local_parse:
+                return await self.parse_content(page, header_selectors, content_selectors)
+            return await self.extract_content(page, header_selectors, content_selectors)
+        finally:
+            await context.close()
+    
+    async def visit_news_site(self, url: str) -> Dict[str, Any]:
+        """Visit news site and collect content"""
         # Site-specific selectors
-        if "bbc" in domain:
-            content_selectors = ["article", ".article__body-content"]
-        elif "reuters" in domain:
-            content_selectors = ["article", ".article-body"]
-        elif "bloomberg" in domain:
-            content_selectors = ["article", ".body-content"]
+        key = match_domain(url)
+        content_selectors = DOMAIN_CONFIG[key]["content"] if key else DEFAULT_CONTENT
+        
+        # Known sites are scraped with tuned selectors, so only unknown ones get emulation;
+        # without scripts the DOM is the served HTML, so it's parsed locally in one CDP call
+        javascript = needs_javascript(key)
+        result = await self.fetch(
+            url, DEFAULT_HEADERS, content_selectors,
+            emulate=key is None, javascript=javascript, local_parse=not javascript
+        )
+        if result is None:
+            return {
+                "url": url,
+                "content": {
+                    "headers": [],
+                    "paragraphs": []
+                }
+            }
+        return result
+    
+    async def visit_news_sites_batch(self, urls: List[str],
+                                     max_concurrency: int = 5) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Visit several news sites concurrently, each in its own browser context
+        
+        Args:
+            urls: Site URLs to visit
+            max_concurrency: Maximum number of sites loaded at once
+            
+        Returns:
+            List with the content of each site in input order, or the exception it raised
+        """
+        tasks = self._start_visits(urls, max_concurrency)
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def visit_news_sites_stream(self, urls: List[str],
+                                      max_concurrency: int = 5) -> AsyncIterator[Union[Dict[str, Any], BaseException]]:
+        """
+        Visit several news sites concurrently, yielding each result as soon as it's ready
+        
+        Args:
+            urls: Site URLs to visit
+            max_concurrency: Maximum number of sites loaded at once
             
-        return self.extract_content(header_selectors, content_selectors)
\ No newline at end of file
+        Yields:
+            Content of each site in completion order, or the exception it raised
+        """
+        tasks = self._start_visits(urls, max_concurrency)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    yield await next_done
+                except Exception as e:
+                    yield e
+        finally:
+            # Stop the remaining visits if the consumer leaves early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _start_visits(self, urls: List[str], max_concurrency: int) -> List[asyncio.Task]:
+        """Schedule visit_news_site() for each URL with at most max_concurrency running"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def visit(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.visit_news_site(url)
+        
+        return [asyncio.ensure_future(visit(url)) for url in urls]
+    
+    async def new_context(self, java_script_enabled: bool = True):
+        """Create an isolated browser context with heavy resources blocked"""
+        browser = await self.get_browser()
+        context = await browser.new_context(**context_options(self.user_agent, java_script_enabled))
+        await context.route("**/*", resource_blocker_async(self.block_resources))
+        return context
+    
+    async def google_search(self, query: str) -> List[str]:
+        """Perform search using a search API or DuckDuckGo and return results"""
+        if self.search_provider is not None:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(None, self.search_provider.search, query)
+            if results:
+                return results
+            log.debug("Search API returned no results, falling back to DuckDuckGo...")
+        
+        context = await self.new_context()
+        try:
+            page = await context.new_page()
+            # Open the results page directly instead of typing into the landing page
+            log.debug("Navigating to DuckDuckGo...")
+            await self.navigate(page, SEARCH_URL.format(query=quote_plus(query)), emulate=False)
+            
+            log.debug("Waiting for search results...")
+            await page.wait_for_selector("article.result", timeout=15000, state="attached")
+            
+            # Extract results
+            log.debug("Extracting results...")
+            results = await page.eval_on_selector_all(SEARCH_RESULT_LINKS, EXTRACT_LINKS_JS)
+            
+            log.info("Found %d results", len(results))
+            return results[:5]  # Return top 5 results
+        except Exception as e:
+            log.warning("Error during search: %s", e)
+            return []
+        finally:
+            await context.close()
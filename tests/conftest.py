@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.agent import WebAgent
+from src.llm_providers import LLMProvider
+
+
+class FakeProvider(LLMProvider):
+    """Provider answering locally so tests never reach an API"""
+
+    name = "fake"
+    model = "fake-model"
+
+    def __init__(self):
+        super().__init__(cache=None)
+        self.api_key = "test"
+        self.api_url = "http://llm.invalid/v1/chat/completions"
+        # Seconds each source's summary takes, by source URL
+        self.summary_delays = {}
+        # Source URLs whose summary request fails
+        self.failing_sources = set()
+
+    def _stream_api(self, system_prompt, user_prompt):
+        yield "report: "
+        yield user_prompt
+
+    async def _generate_async(self, client, semaphore, system_prompt, user_prompt):
+        # Sources come with their URL as the first header, see fake_fetch
+        source = user_prompt.splitlines()[1][len("- "):]
+        await asyncio.sleep(self.summary_delays.get(source, 0))
+        if source in self.failing_sources:
+            raise httpx.HTTPStatusError("429 Too Many Requests", request=None, response=None)
+        return f"summary of {source}"
+
+    def _build_payload(self, system_prompt, user_prompt):
+        return {}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_PATH", raising=False)
+    agent = WebAgent(api_key="test")
+    agent.llm_provider = FakeProvider()
+    return agent
@@ -0,0 +1,129 @@
+import asyncio
+import re
+import time
+
+import pytest
+
+import src.agent
+from src.web_tools import AsyncWebBrowser, _get_pw, _stop_pw
+
+
+class StartedDriverBrowser:
+    """Stands in for WebBrowser after it has started the sync Playwright driver"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        _get_pw()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def visit_news_site(self, url):
+        return {"url": url, "content": {"headers": ["Title"], "paragraphs": ["Body"]}}
+
+
+def test_research_after_run(agent, monkeypatch):
+    monkeypatch.setattr(src.agent, "WebBrowser", StartedDriverBrowser)
+    try:
+        assert agent.run("latest news").startswith("report: ")
+        report = agent.research("topic", source_strategy=lambda topic, depth, browser: [])
+        assert report.startswith("report: Research topic: topic")
+    finally:
+        _stop_pw()
+
+
+def fake_fetch(delays):
+    """AsyncWebBrowser.fetch replacement that takes delays[url] seconds"""
+    async def fetch(self, url, *args, **kwargs):
+        await asyncio.sleep(delays.get(url, 0))
+        if url.endswith("/broken"):
+            return None
+        return {"url": url, "content": {"headers": [url], "paragraphs": [f"text of {url}"]}}
+    return fetch
+
+
+def sources_in_report(report):
+    return re.findall(r"--- SOURCE \d+: (\S+) ---", report)
+
+
+def test_research_keeps_source_order(agent, monkeypatch):
+    urls = ["https://a.test/", "https://b.test/broken", "https://c.test/", "https://d.test/"]
+    monkeypatch.setattr(AsyncWebBrowser, "fetch", fake_fetch({urls[0]: 0.1, urls[2]: 0.05}))
+    agent.llm_provider.summary_delays = {urls[3]: 0.05}
+
+    report = agent.research("topic", depth=4, source_strategy=lambda topic, depth, browser: urls)
+
+    assert sources_in_report(report) == [urls[0], urls[2], urls[3]]
+    assert f"summary of {urls[2]}" in report
+    assert "Time limit exceeded" not in report
+
+
+def test_research_drops_slow_scrapes_and_summaries(agent, monkeypatch):
+    urls = ["https://fast.test/", "https://slow-page.test/", "https://slow-summary.test/"]
+    monkeypatch.setattr(AsyncWebBrowser, "fetch", fake_fetch({urls[1]: 5}))
+    agent.llm_provider.summary_delays = {urls[2]: 5}
+
+    start = time.monotonic()
+    report = agent.research("topic", depth=3, max_time=0.3,
+                            source_strategy=lambda topic, depth, browser: urls)
+
+    assert time.monotonic() - start < 2
+    assert sources_in_report(report) == [urls[0]]
+    assert "Time limit exceeded" in report
+
+
+def test_research_limits_the_source_strategy(agent):
+    async def slow_strategy(topic, depth, browser):
+        await asyncio.sleep(5)
+        return ["https://never.test/"]
+
+    start = time.monotonic()
+    report = agent.research("topic", max_time=0.2, source_strategy=slow_strategy)
+
+    assert time.monotonic() - start < 2
+    assert "Time limit exceeded" in report
+    assert "never.test" not in report
+
+
+def test_final_report_does_not_block_the_loop(agent, monkeypatch):
+    def slow_stream(system_prompt, user_prompt):
+        time.sleep(0.3)
+        yield "report"
+    monkeypatch.setattr(agent.llm_provider, "_stream_api", slow_stream)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.ensure_future(ticker())
+        report = await agent.research_async("topic", source_strategy=lambda topic, depth, browser: [])
+        ticking.cancel()
+        return report, ticks
+
+    report, ticks = asyncio.run(main())
+    assert report == "report"
+    assert ticks >= 10
+
+
+def test_research_skips_failed_summaries(agent, monkeypatch):
+    urls = ["https://a.test/", "https://b.test/", "https://c.test/"]
+    monkeypatch.setattr(AsyncWebBrowser, "fetch", fake_fetch({}))
+    agent.llm_provider.failing_sources = {urls[1]}
+
+    report = agent.research("topic", depth=3, source_strategy=lambda topic, depth, browser: urls)
+
+    assert sources_in_report(report) == [urls[0], urls[2]]
+    assert "429" not in report
+
+
+def test_unknown_source_strategy(agent):
+    with pytest.raises(ValueError, match="Unknown source strategy: nope"):
+        agent.research("topic", source_strategy="nope")
@@ -0,0 +1,39 @@
+from src.http_tools import parse_html
+
+HTML = """
+<h2>Second</h2>
+<h1>First</h1>
+<h3>   </h3>
+<article>
+  <p>One</p>
+  <p></p>
+  <p>Two is a longer paragraph</p>
+</article>
+<p>Three</p>
+"""
+
+
+def parse(header_selectors, content_selectors, limits=None):
+    return parse_html(HTML, "https://example.com/", header_selectors, content_selectors, limits)["content"]
+
+
+def test_selector_order_and_empty_elements():
+    content = parse(["h1", "h2", "h3"], ["p", "article"])
+    assert content["headers"] == ["First", "Second"]
+    assert content["paragraphs"][:3] == ["One", "Two is a longer paragraph", "Three"]
+    assert content["paragraphs"][3].startswith("One")
+    assert len(content["paragraphs"]) == 4
+
+
+def test_duplicate_matches_are_skipped():
+    assert parse(["h1"], ["p", "article p"])["paragraphs"] == ["One", "Two is a longer paragraph", "Three"]
+
+
+def test_limits():
+    content = parse(["h1", "h2"], ["p"], {"headerLimit": 1, "paraLimit": 2, "charLimit": 3})
+    assert content["headers"] == ["Fir"]
+    assert content["paragraphs"] == ["One", "Two"]
+
+
+def test_invalid_selector_keeps_other_matches():
+    assert parse(["h1["], ["p", "p["])["paragraphs"] == ["One", "Two is a longer paragraph", "Three"]
@@ -0,0 +1,30 @@
+from src.llm_cache import DiskLLMCache, make_key
+
+
+def test_miss_then_hit(tmp_path):
+    cache = DiskLLMCache(str(tmp_path / "cache.db"))
+    key = make_key("grok", "grok-beta", "system", "user")
+
+    assert cache.lookup(key) is None
+    cache.update(key, "answer")
+    assert cache.lookup(key) == "answer"
+
+
+def test_update_replaces_and_persists(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = make_key("grok", "grok-beta", "system", "user")
+    DiskLLMCache(path).update(key, "old")
+    DiskLLMCache(path).update(key, "new")
+
+    assert DiskLLMCache(path).lookup(key) == "new"
+
+
+def test_key_depends_on_every_part():
+    keys = {
+        make_key("grok", "grok-beta", "system", "user"),
+        make_key("openai", "grok-beta", "system", "user"),
+        make_key("grok", "gpt-4", "system", "user"),
+        make_key("grok", "grok-beta", "other", "user"),
+        make_key("grok", "grok-beta", "system", "other")
+    }
+    assert len(keys) == 5
@@ -0,0 +1,126 @@
+import httpx
+import orjson
+import requests
+
+from src.llm_cache import DiskLLMCache, make_key
+from src.llm_providers import GrokProvider
+
+
+class StubResponse:
+    """Streaming response replaying fixed SSE lines"""
+
+    def __init__(self, lines, error=None):
+        self.lines = lines
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        yield from self.lines
+        if self.error is not None:
+            raise self.error
+
+
+class StubSession:
+    def __init__(self, response):
+        self.response = response
+
+    def post(self, url, **kwargs):
+        return self.response
+
+
+def sse(obj):
+    return b"data: " + orjson.dumps(obj)
+
+
+def delta(content):
+    return sse({"choices": [{"delta": {"content": content}}]})
+
+
+class MemoryCache:
+    def __init__(self):
+        self.data = {}
+
+    def lookup(self, key):
+        return self.data.get(key)
+
+    def update(self, key, value):
+        self.data[key] = value
+
+
+def make_provider(response, cache=None):
+    provider = GrokProvider("test-key", cache=cache)
+    provider._session = StubSession(response)
+    return provider
+
+
+def test_stream_joins_deltas_and_skips_chunks_without_choices():
+    provider = make_provider(StubResponse([
+        sse({"choices": [], "prompt_filter_results": []}),
+        b"",
+        delta("Hello "),
+        sse({"choices": [{"delta": {}}]}),
+        delta("wörld"),
+        sse({"choices": [], "usage": {"total_tokens": 3}}),
+        b"data: [DONE]",
+        delta("ignored")
+    ]))
+    assert provider.generate_response("system", "user") == "Hello wörld"
+
+
+def test_complete_stream_is_cached():
+    cache = MemoryCache()
+    provider = make_provider(StubResponse([delta("cached answer"), b"data: [DONE]"]), cache)
+    assert provider.generate_response("system", "user") == "cached answer"
+    assert cache.data == {make_key("grok", "grok-beta", "system", "user"): "cached answer"}
+
+
+def test_error_before_content_is_returned_but_not_cached():
+    cache = MemoryCache()
+    provider = make_provider(StubResponse([b"data: {broken"]), cache)
+    assert provider.generate_response("system", "user").startswith("Response processing error: ")
+    assert cache.data == {}
+
+
+def test_error_after_content_is_not_appended():
+    cache = MemoryCache()
+    error = requests.exceptions.ConnectionError("reset")
+    provider = make_provider(StubResponse([delta("partial")], error), cache)
+    assert provider.generate_response("system", "user") == "partial"
+    assert cache.data == {}
+
+
+def test_api_errors_are_not_cached_on_disk(tmp_path):
+    cache = DiskLLMCache(str(tmp_path / "cache.db"))
+    error = requests.exceptions.ConnectionError("refused")
+    provider = make_provider(StubResponse([], error), cache)
+
+    assert provider.generate_response("system", "user") == "API Error: refused"
+    assert cache.lookup(make_key("grok", "grok-beta", "system", "user")) is None
+
+    provider._session = StubSession(StubResponse([delta("fresh"), b"data: [DONE]"]))
+    assert provider.generate_response("system", "user") == "fresh"
+    assert cache.lookup(make_key("grok", "grok-beta", "system", "user")) == "fresh"
+
+
+def test_batch_returns_errors_as_text():
+    provider = GrokProvider("test-key")
+
+    async def generate(client, semaphore, system_prompt, user_prompt):
+        if user_prompt == "bad":
+            raise httpx.ConnectError("refused")
+        if user_prompt == "broken":
+            raise KeyError("choices")
+        return f"answer to {user_prompt}"
+    provider._generate_async = generate
+
+    assert provider.generate_response_batch([("s", "good"), ("s", "bad"), ("s", "broken")]) == [
+        "answer to good", "API Error: refused", "Response processing error: 'choices'"
+    ]
@@ -0,0 +1,36 @@
+from src.prompt_utils import count_tokens, pack, truncate_to_tokens
+
+CHUNKS = [f"Paragraph number {i} with a few more words in it." for i in range(20)]
+
+
+def test_truncate_keeps_short_text():
+    assert truncate_to_tokens("short text", 100) == "short text"
+
+
+def test_truncate_fits_budget():
+    text = " ".join(CHUNKS)
+    truncated = truncate_to_tokens(text, 10)
+    assert text.startswith(truncated)
+    assert 0 < count_tokens(truncated) <= 10
+
+
+def test_truncate_to_nothing():
+    assert truncate_to_tokens("some text", 0) == ""
+
+
+def test_pack_takes_leading_chunks_within_budget():
+    budget = count_tokens(CHUNKS[0]) * 3 + 2
+    packed = pack(CHUNKS, budget)
+
+    assert packed[:3] == CHUNKS[:3]
+    assert len(packed) == 4
+    assert CHUNKS[3].startswith(packed[3])
+    assert sum(count_tokens(chunk) for chunk in packed) <= budget
+
+
+def test_pack_everything_fits():
+    assert pack(CHUNKS[:2], 10_000) == CHUNKS[:2]
+
+
+def test_pack_empty_budget():
+    assert pack(CHUNKS, 0) == []
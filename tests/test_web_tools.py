@@ -0,0 +1,122 @@
+import threading
+from types import SimpleNamespace
+
+import src.web_tools
+from src.http_tools import EXTRACT_LIMITS, parse_html
+from src.web_tools import (
+    DEFAULT_HEADERS, DOMAIN_CONFIG, BrowserPool, WebBrowser, _get_pw, _stop_pw, has_enough_content, match_domain
+)
+
+
+def test_fast_fetch_hit_does_not_touch_the_browser(monkeypatch):
+    paragraphs = ["x" * src.web_tools.FAST_FETCH_MIN_CHARS]
+    page = {"url": "https://www.bbc.com/news/1", "content": {"headers": [], "paragraphs": paragraphs}}
+    monkeypatch.setattr(src.web_tools, "fast_fetch", lambda *args: page)
+
+    # Not entered, so any attempt to check out a page or context would fail
+    browser = WebBrowser()
+    assert browser.visit_news_site("https://www.bbc.com/news/1") is page
+    assert browser.fetch("https://example.com/") is page
+    assert browser._static_context is None
+
+
+def test_match_domain():
+    assert match_domain("https://bbc.com/news") == "bbc.com"
+    assert match_domain("https://www.bbc.co.uk/news/x") == "bbc.co.uk"
+    assert match_domain("https://uk.reuters.com/a") == "reuters.com"
+
+
+def test_match_domain_rejects_lookalikes():
+    assert match_domain("https://notbbc.com/") is None
+    assert match_domain("https://reuters.com.evil.io/") is None
+    assert match_domain("https://bbcxcom.io/") is None
+    assert match_domain("not a url") is None
+
+
+def test_known_domain_selectors_keep_the_whole_article():
+    body = [f"Paragraph {i} " + "word " * 60 for i in range(20)]
+    html = "<article><div class='article__body-content'>" + "".join(f"<p>{p}</p>" for p in body) + "</div></article>"
+
+    content = parse_html(html, "https://www.bbc.com/news/1", DEFAULT_HEADERS,
+                         DOMAIN_CONFIG["bbc.com"]["content"], EXTRACT_LIMITS)["content"]
+
+    assert content["paragraphs"] == [p.strip() for p in body]
+
+
+def test_has_enough_content_counts_text():
+    def result(*paragraphs):
+        return {"url": "u", "content": {"headers": [], "paragraphs": list(paragraphs)}}
+
+    limit = src.web_tools.FAST_FETCH_MIN_CHARS
+    assert has_enough_content(result("x" * limit))
+    assert has_enough_content(result("x" * (limit - 10), "y" * 10))
+    assert not has_enough_content(result(*["short"] * 5))
+    assert not has_enough_content(None)
+
+
+def test_each_thread_gets_its_own_playwright_driver():
+    results = {}
+
+    def use_driver(name):
+        try:
+            pw = _get_pw()
+            pw.request.new_context().dispose()
+            results[name] = pw
+        finally:
+            _stop_pw()
+
+    main_pw = _get_pw()
+    try:
+        worker = threading.Thread(target=use_driver, args=("worker",))
+        worker.start()
+        worker.join()
+        use_driver("main")
+    finally:
+        _stop_pw()
+
+    assert results["main"] is main_pw
+    assert results["worker"] is not main_pw
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **options):
+        return FakeContext(self)
+
+    def close(self):
+        self.connected = False
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def route(self, pattern, handler):
+        pass
+
+
+def test_browser_pool_replaces_disconnected_browser(monkeypatch):
+    launched = []
+
+    def launch(**kwargs):
+        launched.append(FakeBrowser())
+        return launched[-1]
+
+    driver = SimpleNamespace(chromium=SimpleNamespace(launch=launch))
+    monkeypatch.setattr(src.web_tools, "_get_pw", lambda: driver)
+    monkeypatch.setattr(src.web_tools, "CDP_ENDPOINT", None)
+    try:
+        first = BrowserPool.acquire().browser
+        assert BrowserPool.acquire().browser is first
+
+        first.connected = False
+        second = BrowserPool.acquire().browser
+        assert second is not first
+        assert launched == [first, second]
+    finally:
+        BrowserPool.shutdown()